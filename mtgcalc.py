@@ -1,23 +1,55 @@
-from collections import namedtuple, Counter
+from collections import namedtuple, Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
 from urllib.parse import quote as urlquote
 from pathlib import Path
 import csv
+import json
+import lzma
+import math
 import operator
 import random
+import re
 import sqlite3
+import sys
+import time
 
 import click
+import ijson
+import numpy as np
 from rich.console import Console
 from rich.table import Table
 import rich
 import requests
-from Levenshtein import distance
+from requests.adapters import HTTPAdapter, Retry
 
 HOST = "https://api.scryfall.com"
 DEFAULT_HEADERS = {"User-agent": "MTGCalculator/0.1"}
+CACHE_DIR = Path("~/.cache/mtgcalc").expanduser()
+
+# keep-alive with compressed responses (requests negotiates gzip, and
+# brotli too when a decoder is installed), retrying transient scryfall
+# errors (including 429 throttles) with backoff
+SESSION = requests.Session()
+SESSION.headers.update(DEFAULT_HEADERS)
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=10,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+        ),
+    ),
+)
 
 console = Console()
 
+DEBUG = False
+
 
 class Record:
     @classmethod
@@ -56,12 +88,28 @@ class CardReview(
 
 class Card(
     namedtuple(
-        "Card", ("name", "rarity", "prices", "mana_cost", "type_line", "rating", "set")
+        "Card",
+        (
+            "name",
+            "rarity",
+            "prices",
+            "mana_cost",
+            "type_line",
+            "rating",
+            "set",
+            "price_usd",
+            "name_lower",
+        ),
     ),
     Record,
 ):
     @classmethod
     def make(cls, rec_dict):
+        # price the card once, every consumer wants a float
+        prices = rec_dict.get("prices") or {}
+        rec_dict["price_usd"] = float(
+            prices.get("usd") or prices.get("usd_foil") or 0
+        )
         # handle special guests flavor names
         if "flavor_name" in rec_dict:
             print("%s -> %s" % (rec_dict["name"], rec_dict["flavor_name"]))
@@ -73,35 +121,211 @@ class Card(
                 face_dict = dict(rec_dict)
                 face_dict["name"] = face["name"]
                 face_dict["mana_cost"] = face["mana_cost"]
+                face_dict["name_lower"] = sys.intern(face["name"].lower())
                 cards.append(face_dict)
             return list(map(super().make, cards))
+        # lowercase once and intern, the name index and typo scan hit
+        # these strings constantly
+        rec_dict["name_lower"] = sys.intern(rec_dict["name"].lower())
         return [super().make(rec_dict)]
 
     @property
     def type(self):
         return self.type_line.split(" ")[0]
 
-    @property
-    def price(self):
-        return self.prices["usd"] or self.prices["usd_foil"] or 0
+
+def dedupe_cards(raw_cards):
+    # include_extras/include_variations repeat the same card as
+    # showcase/borderless/etc printings, later copies silently win in
+    # the name index downstream, keep the first and skip the rest
+    # before paying for Card.make
+    seen = set()
+    deduped = []
+    for c in raw_cards:
+        key = (c.get("oracle_id"), c.get("name"))
+        if key not in seen:
+            seen.add(key)
+            deduped.append(c)
+    return deduped
 
 
 class Scry:
+    bulk_path = CACHE_DIR / "bulk.json.xz"
+    db_path = CACHE_DIR / "cards.sqlite3"
+
     def __init__(self):
-        pass
+        self._bulk_meta = None
+        self._conn = None
 
     def get_sets(self):
-        sets = requests.get(HOST + "/sets/").json()
+        sets = SESSION.get(HOST + "/sets/").json()
         return list(map(Set.make, sets.get("data")))
 
     def get_set_cards(self, *set_codes):
         cards = []
         for set_code in set_codes:
             if set_code:
-                cards.extend(self._get_set_cards(set_code))
+                cards.extend(_fetch_set_cards(set_code))
+        return cards
+
+    def get_cards_by_names(self, names):
+        # /cards/collection accepts at most 75 identifiers per request
+        cards = []
+        for idx in range(0, len(names), 75):
+            chunk = names[idx : idx + 75]
+            resp = SESSION.post(
+                HOST + "/cards/collection",
+                json={"identifiers": [{"name": n} for n in chunk]},
+            )
+            data = resp.json()
+            for c in data.get("data", ()):
+                cards.extend(Card.make(c))
+            for ident in data.get("not_found", ()):
+                print("no card named %s" % ident.get("name"))
+        return cards
+
+    def _bulk_entry(self):
+        # one small metadata call tells us how current the default_cards
+        # dump is, which also versions the sqlite cache
+        if self._bulk_meta is None:
+            bulk = SESSION.get(HOST + "/bulk-data").json()
+            self._bulk_meta = [
+                b for b in bulk["data"] if b["type"] == "default_cards"
+            ][0]
+        return self._bulk_meta
+
+    def _bulk_cache(self):
+        # refresh the local default_cards dump only when scryfall has
+        # published a newer one since we last downloaded it
+        entry = self._bulk_entry()
+        updated = datetime.fromisoformat(entry["updated_at"]).timestamp()
+        if not self.bulk_path.exists() or self.bulk_path.stat().st_mtime < updated:
+            self.bulk_path.parent.mkdir(parents=True, exist_ok=True)
+            resp = SESSION.get(entry["download_uri"], stream=True)
+            resp.raise_for_status()
+            # write to a temp path and rename into place so an error
+            # body or interrupted download can't leave a fresh-looking
+            # corrupt cache behind
+            tmp_path = self.bulk_path.with_suffix(".tmp")
+            try:
+                with lzma.open(tmp_path, "wb") as fh:
+                    for chunk in resp.iter_content(chunk_size=1 << 20):
+                        fh.write(chunk)
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+            tmp_path.rename(self.bulk_path)
+        return self.bulk_path
+
+    def _bulk_set_cards(self, set_code):
+        # stream-parse the dump one card at a time, keeping only the
+        # requested set instead of materializing the whole array
+        cards = []
+        with lzma.open(self._bulk_cache()) as fh:
+            for c in ijson.items(fh, "item"):
+                if c["set"] != set_code:
+                    continue
+                if "paper" not in c.get("games", ()):
+                    continue
+                cards.append(c)
         return cards
 
+    def _db(self):
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("pragma journal_mode=WAL")
+            conn.execute("pragma synchronous=NORMAL")
+            conn.execute(
+                "create table if not exists cards ("
+                " set_code text, name text, name_lower text, rarity text,"
+                " mana_cost text, type_line text, prices text, price_usd real)"
+            )
+            conn.execute(
+                "create index if not exists idx_set_rarity"
+                " on cards (set_code, rarity)"
+            )
+            conn.execute(
+                "create index if not exists idx_set_name"
+                " on cards (set_code, name_lower)"
+            )
+            conn.execute(
+                "create table if not exists sets ("
+                " set_code text primary key, updated_at text)"
+            )
+            self._conn = conn
+        return self._conn
+
     def _get_set_cards(self, set_code):
+        # serve from the sqlite cache when it was built from the dump
+        # scryfall is currently publishing, otherwise refetch and store
+        db = self._db()
+        updated_at = self._bulk_entry()["updated_at"]
+        row = db.execute(
+            "select updated_at from sets where set_code = ?", (set_code,)
+        ).fetchone()
+        if row and row[0] == updated_at:
+            return self._load_cards(db, set_code)
+        cards = self._fetch_cards(set_code)
+        self._store_cards(db, set_code, updated_at, cards)
+        return cards
+
+    def _load_cards(self, db, set_code):
+        rows = db.execute(
+            "select name, name_lower, rarity, prices, mana_cost, type_line,"
+            " price_usd from cards where set_code = ?",
+            (set_code,),
+        )
+        return [
+            Card(
+                name=name,
+                rarity=rarity,
+                prices=json.loads(prices),
+                mana_cost=mana_cost,
+                type_line=type_line,
+                rating=None,
+                set=set_code,
+                price_usd=price_usd,
+                name_lower=sys.intern(name_lower),
+            )
+            for name, name_lower, rarity, prices, mana_cost, type_line, price_usd in rows
+        ]
+
+    def _store_cards(self, db, set_code, updated_at, cards):
+        db.execute("delete from cards where set_code = ?", (set_code,))
+        db.executemany(
+            "insert into cards values (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    set_code,
+                    c.name,
+                    c.name_lower,
+                    c.rarity,
+                    c.mana_cost,
+                    c.type_line,
+                    json.dumps(c.prices),
+                    c.price_usd,
+                )
+                for c in cards
+            ),
+        )
+        db.execute(
+            "insert or replace into sets values (?, ?)", (set_code, updated_at)
+        )
+        db.commit()
+
+    def _fetch_cards(self, set_code):
+        # the bulk dump covers everything but sets newer than its
+        # updated_at, fall back to a search for those
+        cards = self._bulk_set_cards(set_code)
+        if cards:
+            results = []
+            for c in dedupe_cards(cards):
+                results.extend(Card.make(c))
+            return results
+        return self._search_set_cards(set_code)
+
+    def _search_set_cards(self, set_code):
         cards = []
         url = HOST + f"/cards/search"
         params = {
@@ -112,12 +336,24 @@ class Scry:
             "include_variations": "true",
         }
 
-        pager = requests.get(url, params).json()
-        while True:
-            cards.extend(pager["data"])
-            if not pager.get("has_more"):
-                break
-            pager = requests.get(pager["next_page"]).json()
+        pager = SESSION.get(url, params=params).json()
+        cards.extend(pager["data"])
+        if pager.get("has_more"):
+            # scryfall pages are a fixed size, derive the remaining page
+            # urls from the total and fetch them concurrently
+            page_count = math.ceil(pager["total_cards"] / len(pager["data"]))
+            futures = []
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                for page in range(2, page_count + 1):
+                    futures.append(
+                        pool.submit(SESSION.get, url, params=dict(params, page=page))
+                    )
+                    # stay under scryfall's 10 requests/sec guidance
+                    time.sleep(0.1)
+                # collect in submission order so the card list (and the
+                # first-wins dedupe downstream) is stable across runs
+                for fut in futures:
+                    cards.extend(fut.result().json()["data"])
 
         cards = [c for c in cards]
         #        if (
@@ -128,16 +364,29 @@ class Scry:
         #        )]
 
         results = []
-        for c in cards:
+        for c in dedupe_cards(cards):
             results.extend(Card.make(c))
         return results
 
 
+# shared fetcher so repeat lookups of a set code hit the cache instead
+# of the network, no matter how many Scry instances get created
+_scry = None
+
+
+@lru_cache(maxsize=8)
+def _fetch_set_cards(set_code):
+    global _scry
+    if _scry is None:
+        _scry = Scry()
+    return tuple(_scry._get_set_cards(set_code))
+
+
 def get_set_rarity(cards):
-    rarities = {}
+    rarities = defaultdict(list)
     for c in cards:
-        rarities.setdefault(c.rarity, []).append(c)
-    return rarities
+        rarities[c.rarity].append(c)
+    return dict(rarities)
 
 
 class PlayBooster:
@@ -147,22 +396,9 @@ class PlayBooster:
 
     def get_cards(self, card_set_rarity):
         pack_cards = []
-        # commons
-        commons = list(card_set_rarity["common"])
-
-        for c in range(6):
-            common_card = random.choice(commons)
-            commons.remove(common_card)
-            pack_cards.append(common_card)
-
-        uncommons = list(card_set_rarity["uncommon"])
-        for c in range(3):
-            uncommon_card = random.choice(uncommons)
-            uncommons.remove(uncommon_card)
-            pack_cards.append(uncommon_card)
-
-        mythics = list(card_set_rarity["mythic"])
-        rares = list(card_set_rarity["rare"])
+        # sample draws without replacement, no copy or O(n) remove
+        pack_cards.extend(random.sample(card_set_rarity["common"], 6))
+        pack_cards.extend(random.sample(card_set_rarity["uncommon"], 3))
 
         for c in range(1):
             rare_type = "rare"
@@ -189,6 +425,74 @@ class PlayBooster:
         return pack_cards
 
 
+class CardSet:
+    # columnar layout for the numeric paths: one contiguous column per
+    # field instead of attribute access on a namedtuple per card
+    def __init__(self, cards):
+        self.cards = list(cards)
+        self.names = [c.name for c in self.cards]
+        self.mana_costs = [c.mana_cost for c in self.cards]
+        levels = sorted({c.rarity for c in self.cards})
+        self.rarity_levels = tuple(levels)
+        codes = {r: i for i, r in enumerate(levels)}
+        n = len(self.cards)
+        self.rarities = np.fromiter(
+            (codes[c.rarity] for c in self.cards), np.uint8, count=n
+        )
+        # zero bulk under a dime here so draws can sum columns
+        # without masking
+        prices = np.array([c.price_usd for c in self.cards], float)
+        prices[prices < 0.10] = 0.0
+        self.prices = prices
+
+    def rarity_prices(self):
+        return {
+            rarity: self.prices[self.rarities == code]
+            for code, rarity in enumerate(self.rarity_levels)
+        }
+
+
+def simulate_boxes(card_set, count):
+    # vectorized equivalent of dealing PlayBooster packs one at a time,
+    # drawing the slots for all count * 36 packs at once instead of a
+    # python loop per card
+    rng = np.random.default_rng()
+    n_packs = count * 36
+    prices = card_set.rarity_prices()
+
+    # flatten the rarity columns into one array so every random slot is
+    # drawn by a single batched kernel over rarity codes
+    order = ("common", "uncommon", "rare", "mythic")
+    sizes = np.array([len(prices[r]) for r in order])
+    offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    price_col = np.concatenate([prices[r] for r in order])
+
+    value = 0.0
+    rarity_distribution = Counter()
+
+    # 6 commons and 3 uncommons, drawn without replacement per pack
+    for rarity, slots in (("common", 6), ("uncommon", 3)):
+        ranks = rng.random((n_packs, len(prices[rarity]))).argsort(axis=1)
+        value += prices[rarity][ranks[:, :slots]].sum()
+        rarity_distribution[rarity] += slots * n_packs
+
+    # rarity code per random slot: the rare slot upgrades to mythic 13%
+    # of the time, the two wildcards keep the old per-pack odds
+    rare_slot = np.where(rng.integers(0, 101, n_packs) < 13, 3, 2)
+    rtype = rng.integers(0, 11, 2 * n_packs)
+    wild = np.where(rtype < 6, 0, np.where(rtype == 9, 2, 1))
+    upgrade = (wild == 2) & (rng.integers(0, 101, 2 * n_packs) < 13)
+    wild[upgrade] = 3
+    codes = np.concatenate([rare_slot, wild])
+
+    # one uniform index per slot within its rarity's slice of the column
+    value += price_col[offsets[codes] + rng.integers(0, sizes[codes])].sum()
+    for code, n in enumerate(np.bincount(codes, minlength=len(order))):
+        rarity_distribution[order[code]] += int(n)
+
+    return float(value), rarity_distribution
+
+
 PACK_TYPES = {
     "Collector": {},
     "Play": {
@@ -206,8 +510,10 @@ PACK_TYPES = {
 
 
 @click.group()
-def cli():
-    pass
+@click.option("--debug", is_flag=True, help="Drop into pdb when a command fails.")
+def cli(debug):
+    global DEBUG
+    DEBUG = debug
 
 
 @cli.command()
@@ -236,8 +542,55 @@ def sets():
     console.print(table)
 
 
+class TypoIndex:
+    # trie over the candidate names walked with the classic row-per-node
+    # edit distance dynamic program: shared prefixes are scored once for
+    # the whole candidate set, and any branch whose row minimum already
+    # exceeds the best hit so far is pruned
+    def __init__(self, names):
+        self.root = {}
+        for name in names:
+            node = self.root
+            for ch in name:
+                node = node.setdefault(ch, {})
+            node[""] = name
+
+    def search(self, word, max_dist):
+        # closest candidate name within max_dist edits, or None
+        best = [None, max_dist + 1]
+
+        def walk(node, ch, prev_row):
+            row = [prev_row[0] + 1]
+            for col in range(1, len(word) + 1):
+                row.append(
+                    min(
+                        row[col - 1] + 1,
+                        prev_row[col] + 1,
+                        prev_row[col - 1] + (word[col - 1] != ch),
+                    )
+                )
+            if "" in node and row[-1] < best[1]:
+                best[0], best[1] = node[""], row[-1]
+            if min(row) < best[1]:
+                for next_ch, child in node.items():
+                    if next_ch:
+                        walk(child, next_ch, row)
+
+        first_row = list(range(len(word) + 1))
+        for ch, child in self.root.items():
+            if ch:
+                walk(child, ch, first_row)
+        if best[0] is None:
+            return None
+        return best[0], best[1]
+
+
 class SetReview:
     colors = {"white", "black", "blue", "green", "multicolored", "lands"}
+    # one C-level match per line instead of a pile of per-line
+    # split/count/startswith scans
+    color_re = re.compile(r"^(%s):" % "|".join(sorted(colors)), re.I)
+    card_re = re.compile(r"^(?P<number>\d+)\s*-\s*(?P<name>[^-]+)-\s*(?P<rating>.+)$")
 
     def __init__(self):
         self.groups = {}
@@ -258,34 +611,29 @@ class SetReview:
         cards = []
         group = None
         card = {}
-        buf = []
         for l in text.splitlines():
             if not l.strip():
                 continue
-            buf.append(l)
-            if ":" in l:
-                for c in cls.colors:
-                    l.lower().startswith(f"%s:" % c)
-                    group = c
-                    break
-            elif "-" in l and l.count("-") in (2, 3):
-                check, remain = l.split("-", 1)
-                if check.strip().isdecimal():
-                    if card:
-                        cards.append(card)
-                    number, name, rating = l.split("-", 2)
-                    if name.lower().startswith("mana"):
-                        pass
-                    elif name.lower().isdigit():
-                        pass
-                    card = {
-                        "number": number.strip(),
-                        "name": name.strip(),
-                        "rating": rating.strip(),
-                        "color": group,
-                    }
-            elif card and l.strip():
+            m = cls.color_re.match(l)
+            if m:
+                # previously any line with a colon reset the group to an
+                # arbitrary color, now only real section headings do
+                group = m.group(1).lower()
+                continue
+            m = cls.card_re.match(l)
+            if m:
+                if card:
+                    cards.append(card)
+                card = {
+                    "number": m.group("number"),
+                    "name": m.group("name").strip(),
+                    "rating": m.group("rating").strip(),
+                    "color": group,
+                }
+            elif card:
                 card.setdefault("notes", []).append(l)
+        if card:
+            cards.append(card)
         return cards
 
 
@@ -306,7 +654,7 @@ def cheatsheet(set_review, set_code, output, spg_code=None):
     cards = Scry().get_set_cards(set_code, spg_code)
     print("Reviewed in set %d" % len(reviews))
     print("Cards in set %d" % len(cards))
-    named = {c.name.lower(): c for c in cards}
+    named = {c.name_lower: c for c in cards}
 
     # handle flip cards
     for n in list(named):
@@ -317,24 +665,36 @@ def cheatsheet(set_review, set_code, output, spg_code=None):
     not_found = []
     found = []
     reviewed = {c["name"]: c for c in reviews}
+
+    # reviews can cover cards outside the set proper (bonus sheets,
+    # special guests), resolve those by exact name in batches of 75
+    # rather than fetching any more whole sets
+    missing = [n for n in reviewed if n.lower() not in named]
+    if missing:
+        for card in Scry().get_cards_by_names(missing):
+            named[card.name_lower] = card
+
+    # one trie over the set names answers every typo query in a single
+    # pruned walk, independent of how many candidates there are
+    typo_index = TypoIndex(named)
+
     for card_name in list(reviewed):
         card = reviewed[card_name]
         if card_name.lower() in named:
             found.append(card)
         else:
-            found_typo = False
-            for n in named:
-                if distance(card_name, n) <= 4:
-                    reviewed[n] = reviewed[card_name]
-                    found_typo = True
-            if not found_typo:
+            # typo in the review, take the closest set card within
+            # edit distance 4
+            match = typo_index.search(card_name.lower(), 4)
+            if match:
+                # move the review onto the corrected name so the typo'd
+                # key doesn't linger and shadow the rating merge
+                reviewed[match[0]] = reviewed.pop(card_name)
+                found.append(card)
+            else:
                 not_found.append(card)
 
     print(f"found: {len(found)} not_found: {len(not_found)}")
-    import pdb
-
-    pdb.set_trace()
-    # debug print not found
     for c in sorted(not_found, key=operator.itemgetter("name")):
         print(repr(c["name"]))
 
@@ -348,42 +708,46 @@ def cheatsheet(set_review, set_code, output, spg_code=None):
     # group the cards by color, multi-color, artifact, land
     grouped_cards = group_sheet(named)
 
-    writer = csv.writer(output)
+    # build the sheet in memory and hand it to _csv in one writerows
+    # call rather than a python call per row
+    by_name = operator.attrgetter("name")
+    rows = []
     for color in ("Black", "Blue", "Green", "Red", "White", "Multi", "Lands"):
-        card_set = grouped_cards[color]
-        writer.writerow((color,))
-        for card in sorted(card_set, key=operator.attrgetter("name")):
-            writer.writerow((card.name, card.rating, card.rarity))
-        writer.writerow(("",))
+        rows.append((color,))
+        rows.extend(
+            (card.name, card.rating, card.rarity)
+            for card in sorted(grouped_cards[color], key=by_name)
+        )
+        rows.append(("",))
+    csv.writer(output).writerows(rows)
+
+
+COLOR_BITS = {"W": 1, "U": 2, "B": 4, "R": 8, "G": 16}
+COLOR_NAMES = {1: "White", 2: "Blue", 4: "Black", 8: "Red", 16: "Green"}
 
 
 def group_sheet(cards):
-    color_map = {"B": "Black", "G": "Green", "W": "White", "U": "Blue", "R": "Red"}
-    grouped = {}
+    grouped = defaultdict(list)
 
     for name in cards:
         card = cards[name]
         if card.mana_cost == "":
-            grouped.setdefault("Lands", []).append(card)
+            grouped["Lands"].append(card)
             continue
 
-        multi = False
-        color = ""
-        for c in color_map:
-            if c in card.mana_cost:
-                if color:
-                    multi = True
-                else:
-                    color = c
-
-        if multi:
-            grouped.setdefault("Multi", []).append(card)
-            continue
+        # fold the mana cost into a 5-bit color mask, one scan of the
+        # cost string instead of a substring search per color
+        mask = 0
+        for ch in card.mana_cost:
+            mask |= COLOR_BITS.get(ch, 0)
 
-        if color:
-            grouped.setdefault(color_map[color], []).append(card)
+        count = mask.bit_count()
+        if count == 1:
+            grouped[COLOR_NAMES[mask]].append(card)
+        elif count >= 2:
+            grouped["Multi"].append(card)
 
-    return grouped
+    return dict(grouped)
 
 
 @cli.command()
@@ -402,11 +766,15 @@ def pack(set_code):
 
     for card in cards:
         table.add_row(
-            card.rarity.title(), str(card.price), card.type, card.mana_cost, card.name
+            card.rarity.title(),
+            str(card.price_usd),
+            card.type,
+            card.mana_cost,
+            card.name,
         )
 
     console.print(table)
-    value = sum([float(card.price) for card in cards])
+    value = sum([card.price_usd for card in cards])
     console.print(f"Total Value: ${value}")
 
 
@@ -414,20 +782,9 @@ def pack(set_code):
 @click.option("--set-code", required=True)
 @click.option("--count", default=1)
 def box_value(set_code, count):
-    set_cards = Scry().get_set_cards(set_code)
-    cards_by_rarity = get_set_rarity(set_cards)
-
-    rarity_distribution = Counter()
-
-    value = 0.0
+    card_set = CardSet(Scry().get_set_cards(set_code))
 
-    for i in range(count):
-        for pidx in range(36):
-            for card in PlayBooster().get_cards(cards_by_rarity):
-                rarity_distribution[card.rarity] += 1
-                if float(card.price) < 0.10:
-                    continue
-                value += float(card.price)
+    value, rarity_distribution = simulate_boxes(card_set, count)
 
     rich.print("Box Value %0.2f" % (value / count))
     rich.print("Rarity Distribution %s" % rarity_distribution)
@@ -437,7 +794,10 @@ if __name__ == "__main__":
     try:
         cli()
     except Exception:
-        import pdb, sys, traceback
+        if not DEBUG:
+            raise
+        import pdb
+        import traceback
 
         traceback.print_exc()
         pdb.post_mortem(sys.exc_info()[-1])